@@ -5,37 +5,79 @@
 生成符合专利要求的黑色线条图，包含详细的标记和说明
 """
 
+import os
+import json
+import hashlib
+import functools
+import multiprocessing
+
+import matplotlib
+# 显式使用非交互式的Agg后端，工作进程无需探测GUI后端
+matplotlib.use('Agg')
+# 图中只有直线和少量装饰曲线，允许更激进的路径简化
+matplotlib.rcParams.update({'path.simplify': True,
+                            'path.simplify_threshold': 1.0,
+                            'agg.path.chunksize': 10000})
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch, ConnectionPatch
+from matplotlib.patches import FancyBboxPatch, PathPatch, Rectangle
+from matplotlib.path import Path
+from matplotlib.collections import PatchCollection, LineCollection, PolyCollection
 import numpy as np
 from matplotlib.patches import Polygon
 import matplotlib.patches as mpatches
 import matplotlib.font_manager as fm
+from matplotlib.font_manager import FontProperties
 
-# 设置中文字体 - 使用更通用的方法
-def setup_chinese_font():
-    """设置中文字体"""
+try:
+    from numba import njit
+except ImportError:
+    # 未安装numba时退化为普通numpy函数
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+# 字体检测结果的缓存文件，删除后下次运行会重新扫描系统字体
+FONT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'patent_diagrams_font.txt')
+
+def find_chinese_font():
+    """扫描系统字体，返回第一个可用的中文字体名；未找到时返回空字符串"""
     # 尝试多种中文字体
     chinese_fonts = ['SimHei', 'Microsoft YaHei', 'WenQuanYi Micro Hei', 'Noto Sans CJK SC', 
                      'Source Han Sans CN', 'PingFang SC', 'Hiragino Sans GB', 'STHeiti']
     
     # 查找可用的中文字体
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
-    selected_font = None
-    
+    available_fonts = {f.name for f in fm.fontManager.ttflist}
     for font in chinese_fonts:
         if font in available_fonts:
-            selected_font = font
-            break
-    
-    if selected_font is None:
-        # 如果没有找到中文字体，使用默认字体并添加字体文件
-        try:
-            # 尝试使用系统默认字体
-            plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial Unicode MS', 'Liberation Sans']
-        except:
-            pass
+            return font
+    return ''
+
+# 设置中文字体 - 使用更通用的方法
+@functools.lru_cache(maxsize=1)
+def setup_chinese_font():
+    """设置中文字体
+    优先读取 FONT_CACHE_PATH 中缓存的字体名；缓存不存在或为空时扫描 fontManager，
+    仅在找到中文字体时写入缓存，以便之后安装字体能被重新检测到
+    """
+    try:
+        with open(FONT_CACHE_PATH, 'r', encoding='utf-8') as f:
+            selected_font = f.read().strip()
+    except OSError:
+        selected_font = ''
+    
+    if not selected_font:
+        selected_font = find_chinese_font()
+        if selected_font:
+            try:
+                os.makedirs(os.path.dirname(FONT_CACHE_PATH), exist_ok=True)
+                with open(FONT_CACHE_PATH, 'w', encoding='utf-8') as f:
+                    f.write(selected_font)
+            except OSError:
+                pass
+    
+    if not selected_font:
+        # 如果没有找到中文字体，使用系统默认字体
+        plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial Unicode MS', 'Liberation Sans']
     else:
         plt.rcParams['font.sans-serif'] = [selected_font, 'DejaVu Sans']
     
@@ -44,315 +86,383 @@ def setup_chinese_font():
 # 调用字体设置函数
 setup_chinese_font()
 
-def create_system_architecture_diagram():
-    """生成系统整体架构图"""
-    fig, ax = plt.subplots(1, 1, figsize=(16, 12))
-    ax.set_xlim(0, 16)
-    ax.set_ylim(0, 12)
-    ax.axis('off')
-    
+# 预先构建的字体属性，所有文本共用，避免每个Text各自创建字体对象
+_FP_TITLE = FontProperties(size=16, weight='bold')
+_FP_HEADING = FontProperties(size=12, weight='bold')
+_FP_10_BOLD = FontProperties(size=10, weight='bold')
+_FP_10 = FontProperties(size=10)
+_FP_9 = FontProperties(size=9)
+_FP_8 = FontProperties(size=8)
+
+# 单位正方形的四个顶点，用于批量生成矩形
+UNIT_SQUARE = np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
+
+def box_vertices(boxes, pad=0.1):
+    """将 (x, y, 宽, 高) 列表转换为 PolyCollection 所需的 (N, 4, 2) 矩形顶点数组
+    pad 与 FancyBboxPatch 的 round,pad=0.1 一致，矩形外框大小保持不变
+    """
+    boxes = np.asarray(boxes, dtype=float)
+    origins = boxes[:, None, :2] - pad
+    sizes = boxes[:, None, 2:] + 2 * pad
+    return origins + sizes * UNIT_SQUARE
+
+def rect_box(xy, width, height, pad=0.1, **kwargs):
+    """与 FancyBboxPatch(boxstyle="round,pad=...") 外框大小相同的直角矩形
+    圆角在输出分辨率下几乎不可见，直角矩形只需4个顶点
+    """
+    x, y = xy
+    return Rectangle((x - pad, y - pad), width + 2 * pad, height + 2 * pad, **kwargs)
+
+# 单个箭头的路径指令：箭杆一段直线 + 闭合的三角形箭头
+ARROW_CODES = np.array([Path.MOVETO, Path.LINETO,
+                        Path.MOVETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], dtype=Path.code_type)
+
+def draw_arrows(ax, arrows, head_width=0.1, head_length=0.1, linewidth=2, linestyle='-'):
+    """批量绘制箭头
+    arrows 为 (x, y, dx, dy) 列表，含义与 ax.arrow 相同（箭头不计入长度）。
+    所有箭杆与箭头合并为一条复合路径，用单个PathPatch绘制。
+    """
+    arrows = np.asarray(arrows, dtype=float)
+    start = arrows[:, :2]
+    end = start + arrows[:, 2:]
+    unit = arrows[:, 2:] / np.hypot(arrows[:, 2], arrows[:, 3])[:, None]
+    normal = unit[:, ::-1] * [-1, 1]
+    tip = end + unit * head_length
+    head_left = end + normal * head_width / 2
+    head_right = end - normal * head_width / 2
+    # (N, 6, 2) 顶点与 ARROW_CODES 一一对应，CLOSEPOLY 的顶点不参与绘制
+    vertices = np.stack([start, end, head_left, tip, head_right, head_left], axis=1)
+    path = Path(vertices.reshape(-1, 2), np.tile(ARROW_CODES, len(arrows)))
+    # 箭杆只有两个点，填充时面积为零，因此整条路径可以直接按实心填充
+    ax.add_patch(PathPatch(path, facecolor='black', edgecolor='black',
+                           linewidth=linewidth, linestyle=linestyle))
+
+# 画布 16x12 英寸对应坐标范围 16x12，1个坐标单位约为72磅
+POINTS_PER_UNIT = 72
+# 单行文本的行高（字号的倍数），常用中文字体的 ascent+descent 约为1个字号
+LINE_HEIGHT = 1.0
+
+def draw_text_lines(ax, x, y, lines, pitch, fontproperties=_FP_8, ha='center'):
+    """用单个Text对象绘制多行文本
+    首行垂直居中于 y，之后每行约下移 pitch 个坐标单位，
+    近似等同于逐行调用 ax.text(..., va='center')。
+    """
+    # 每行占据 pitch 高度，因此块顶部位于首行中心上方半个 pitch
+    line_height = LINE_HEIGHT * fontproperties.get_size_in_points() / POINTS_PER_UNIT
+    ax.text(x, y + pitch / 2, '\n'.join(lines), ha=ha, va='top',
+            fontproperties=fontproperties, linespacing=pitch / line_height)
+
+def draw_text_columns(ax, blocks, pitch, fontproperties=_FP_8):
+    """将同一 x 坐标上的多个文本块合并为一个Text对象绘制
+    blocks 为 (x, y, 文本行列表) 列表，y 为首行中心；同列相邻块之间用空行占位，
+    因此块的纵向间距需为 pitch 的整数倍。
+    """
+    columns = {}
+    for x, y, lines in blocks:
+        columns.setdefault(x, []).append((y, lines))
+    for x, column in columns.items():
+        column.sort(key=lambda block: -block[0])
+        top = column[0][0]
+        merged = []
+        for y, lines in column:
+            merged += [''] * (round((top - y) / pitch) - len(merged))
+            merged += lines
+        draw_text_lines(ax, x, top, merged, pitch, fontproperties)
+
+@njit(cache=True, fastmath=True)
+def _wave(x, a, f, d, off, phase=0.0):
+    """衰减正弦曲线 off + a*sin(x*f + phase)*exp(-x/d)"""
+    return off + a * np.sin(x * f + phase) * np.exp(-x / d)
+
+def compute_mini_chart_lines():
+    """计算监控界面中CPU/内存/网络三个迷你图表的模拟曲线，返回 (3, 10, 2) 顶点数组"""
+    t = np.linspace(0, 3.6, 10)
+    x = np.stack([1.2 + t, 5.7 + t, 10.2 + t])
+    # 内存曲线为余弦，即相位前移 pi/2 的正弦
+    y = np.stack([_wave(x[0], 0.8, 2.0, 3.0, 9.5),
+                  _wave(x[1], 0.6, 1.5, 4.0, 9.5, np.pi / 2),
+                  _wave(x[2], 0.7, 3.0, 5.0, 9.5)])
+    return np.stack([x, y], axis=-1)
+
+# 装饰曲线是固定数据，导入时计算一次，每次绘图直接复用
+MINI_CHART_LINES = compute_mini_chart_lines()
+
+def create_system_architecture_diagram(ax):
+    """在给定坐标轴上绘制系统整体架构图"""
     # 标题
-    ax.text(8, 11.5, '系统整体架构图', fontsize=16, fontweight='bold', ha='center')
+    ax.text(8, 11.5, '系统整体架构图', fontproperties=_FP_TITLE, ha='center')
+    
+    # 模块外框 (x, y, 宽, 高)，最后作为一个PolyCollection统一添加
+    modules = []
     
     # 1. 用户终端
-    user_terminal = FancyBboxPatch((0.5, 9), 2, 1.5, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(user_terminal)
-    ax.text(1.5, 9.75, '1. 用户终端', ha='center', va='center', fontsize=10)
+    modules.append((0.5, 9, 2, 1.5))
+    ax.text(1.5, 9.75, '1. 用户终端', ha='center', va='center', fontproperties=_FP_10)
     
     # 2. 负载均衡器
-    load_balancer = FancyBboxPatch((3.5, 9), 2, 1.5, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(load_balancer)
-    ax.text(4.5, 9.75, '2. 负载均衡器', ha='center', va='center', fontsize=10)
+    modules.append((3.5, 9, 2, 1.5))
+    ax.text(4.5, 9.75, '2. 负载均衡器', ha='center', va='center', fontproperties=_FP_10)
     
     # 3. 面板服务
-    panel_service = FancyBboxPatch((6.5, 9), 2, 1.5, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(panel_service)
-    ax.text(7.5, 9.75, '3. 面板服务', ha='center', va='center', fontsize=10)
+    modules.append((6.5, 9, 2, 1.5))
+    ax.text(7.5, 9.75, '3. 面板服务', ha='center', va='center', fontproperties=_FP_10)
     
     # 4. 前端界面
-    frontend = FancyBboxPatch((9.5, 9), 2, 1.5, boxstyle="round,pad=0.1", 
-                              facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(frontend)
-    ax.text(10.5, 9.75, '4. 前端界面', ha='center', va='center', fontsize=10)
+    modules.append((9.5, 9, 2, 1.5))
+    ax.text(10.5, 9.75, '4. 前端界面', ha='center', va='center', fontproperties=_FP_10)
     
     # 5. 数据库
-    database = FancyBboxPatch((12.5, 9), 2, 1.5, boxstyle="round,pad=0.1", 
-                              facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(database)
-    ax.text(13.5, 9.75, '5. 数据库', ha='center', va='center', fontsize=10)
+    modules.append((12.5, 9, 2, 1.5))
+    ax.text(13.5, 9.75, '5. 数据库', ha='center', va='center', fontproperties=_FP_10)
     
     # 6. 守护进程
-    daemon = FancyBboxPatch((3.5, 7), 2, 1.5, boxstyle="round,pad=0.1", 
-                            facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(daemon)
-    ax.text(4.5, 7.75, '6. 守护进程', ha='center', va='center', fontsize=10)
+    modules.append((3.5, 7, 2, 1.5))
+    ax.text(4.5, 7.75, '6. 守护进程', ha='center', va='center', fontproperties=_FP_10)
     
     # 7. 容器集群
-    container_cluster = FancyBboxPatch((0.5, 5), 3, 2, boxstyle="round,pad=0.1", 
-                                      facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(container_cluster)
-    ax.text(2, 6.5, '7. 容器集群', ha='center', va='center', fontsize=10)
-    ax.text(2, 6, 'Container 1', ha='center', va='center', fontsize=8)
-    ax.text(2, 5.5, 'Container 2', ha='center', va='center', fontsize=8)
-    ax.text(2, 5, 'Container N', ha='center', va='center', fontsize=8)
+    modules.append((0.5, 5, 3, 2))
+    ax.text(2, 6.5, '7. 容器集群', ha='center', va='center', fontproperties=_FP_10)
+    draw_text_lines(ax, 2, 6, ['Container 1', 'Container 2', 'Container N'], 0.5)
     
     # 8. 监控系统
-    monitoring = FancyBboxPatch((4.5, 5), 2, 2, boxstyle="round,pad=0.1", 
-                               facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(monitoring)
-    ax.text(5.5, 6.5, '8. 监控系统', ha='center', va='center', fontsize=10)
+    modules.append((4.5, 5, 2, 2))
+    ax.text(5.5, 6.5, '8. 监控系统', ha='center', va='center', fontproperties=_FP_10)
     
     # 9. 资源调度器
-    scheduler = FancyBboxPatch((7.5, 5), 2, 2, boxstyle="round,pad=0.1", 
-                               facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(scheduler)
-    ax.text(8.5, 6.5, '9. 资源调度器', ha='center', va='center', fontsize=10)
+    modules.append((7.5, 5, 2, 2))
+    ax.text(8.5, 6.5, '9. 资源调度器', ha='center', va='center', fontproperties=_FP_10)
     
     # 10. 网络交换机
-    network_switch = FancyBboxPatch((10.5, 5), 2, 2, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(network_switch)
-    ax.text(11.5, 6.5, '10. 网络交换机', ha='center', va='center', fontsize=10)
+    modules.append((10.5, 5, 2, 2))
+    ax.text(11.5, 6.5, '10. 网络交换机', ha='center', va='center', fontproperties=_FP_10)
+    
+    ax.add_collection(PolyCollection(box_vertices(modules), facecolors='white',
+                                     edgecolors='black', linewidths=2))
+    
+    # 连接线（先收集，最后批量绘制）
+    arrows = []
     
-    # 连接线
     # 用户终端到负载均衡器
-    ax.arrow(2.5, 9.75, 0.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(2.9, 9.5, 'HTTP/HTTPS', ha='center', va='center', fontsize=8)
+    arrows.append((2.5, 9.75, 0.8, 0))
+    ax.text(2.9, 9.5, 'HTTP/HTTPS', ha='center', va='center', fontproperties=_FP_8)
     
     # 负载均衡器到面板服务
-    ax.arrow(5.5, 9.75, 0.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(5.9, 9.5, 'HTTP/HTTPS', ha='center', va='center', fontsize=8)
+    arrows.append((5.5, 9.75, 0.8, 0))
+    ax.text(5.9, 9.5, 'HTTP/HTTPS', ha='center', va='center', fontproperties=_FP_8)
     
     # 面板服务到前端界面
-    ax.arrow(8.5, 9.75, 0.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(8.9, 9.5, 'HTTP/HTTPS', ha='center', va='center', fontsize=8)
+    arrows.append((8.5, 9.75, 0.8, 0))
+    ax.text(8.9, 9.5, 'HTTP/HTTPS', ha='center', va='center', fontproperties=_FP_8)
     
     # 面板服务到数据库
-    ax.arrow(8.5, 9, 3.8, -1.2, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(10.5, 7.5, 'SQL', ha='center', va='center', fontsize=8)
+    arrows.append((8.5, 9, 3.8, -1.2))
+    ax.text(10.5, 7.5, 'SQL', ha='center', va='center', fontproperties=_FP_8)
     
     # 面板服务到守护进程
-    ax.arrow(7.5, 9, -3.8, -1.2, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(5.5, 7.5, 'WebSocket', ha='center', va='center', fontsize=8)
+    arrows.append((7.5, 9, -3.8, -1.2))
+    ax.text(5.5, 7.5, 'WebSocket', ha='center', va='center', fontproperties=_FP_8)
     
     # 守护进程到容器集群
-    ax.arrow(4.5, 7, -3.8, -1.2, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(2.5, 5.5, 'API', ha='center', va='center', fontsize=8)
+    arrows.append((4.5, 7, -3.8, -1.2))
+    ax.text(2.5, 5.5, 'API', ha='center', va='center', fontproperties=_FP_8)
     
     # 容器集群到监控系统
-    ax.arrow(3.5, 6, 0.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(3.9, 5.7, '监控数据', ha='center', va='center', fontsize=8)
+    arrows.append((3.5, 6, 0.8, 0))
+    ax.text(3.9, 5.7, '监控数据', ha='center', va='center', fontproperties=_FP_8)
     
     # 监控系统到资源调度器
-    ax.arrow(6.5, 6, 0.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(6.9, 5.7, '调度指令', ha='center', va='center', fontsize=8)
+    arrows.append((6.5, 6, 0.8, 0))
+    ax.text(6.9, 5.7, '调度指令', ha='center', va='center', fontproperties=_FP_8)
     
     # 资源调度器到网络交换机
-    ax.arrow(9.5, 6, 0.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(9.9, 5.7, '网络流量', ha='center', va='center', fontsize=8)
+    arrows.append((9.5, 6, 0.8, 0))
+    ax.text(9.9, 5.7, '网络流量', ha='center', va='center', fontproperties=_FP_8)
     
-    plt.tight_layout()
-    plt.savefig('图1-系统整体架构图.png', dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    draw_arrows(ax, arrows)
 
-def create_scheduling_flow_diagram():
-    """生成算力调度流程图"""
-    fig, ax = plt.subplots(1, 1, figsize=(16, 12))
-    ax.set_xlim(0, 16)
-    ax.set_ylim(0, 12)
-    ax.axis('off')
-    
+def create_scheduling_flow_diagram(ax):
+    """在给定坐标轴上绘制算力调度流程图"""
     # 标题
-    ax.text(8, 11.5, '算力调度流程图', fontsize=16, fontweight='bold', ha='center')
+    ax.text(8, 11.5, '算力调度流程图', fontproperties=_FP_TITLE, ha='center')
+    
+    # 所有图形先收集起来，最后作为一个PatchCollection统一添加
+    boxes = []
     
     # 11. 系统启动
     start_ellipse = patches.Ellipse((8, 10), 3, 1, facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(start_ellipse)
-    ax.text(8, 10, '11. 系统启动', ha='center', va='center', fontsize=10)
+    boxes.append(start_ellipse)
+    ax.text(8, 10, '11. 系统启动', ha='center', va='center', fontproperties=_FP_10)
     
     # 12. 初始化监控模块
-    init_monitor = FancyBboxPatch((6, 8.5), 4, 1, boxstyle="round,pad=0.1", 
-                                 facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(init_monitor)
-    ax.text(8, 9, '12. 初始化监控模块', ha='center', va='center', fontsize=10)
+    init_monitor = rect_box((6, 8.5), 4, 1, 
+                            facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(init_monitor)
+    ax.text(8, 9, '12. 初始化监控模块', ha='center', va='center', fontproperties=_FP_10)
     
     # 13. 收集系统资源信息
-    collect_info = FancyBboxPatch((6, 7), 4, 1, boxstyle="round,pad=0.1", 
-                                 facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(collect_info)
-    ax.text(8, 7.5, '13. 收集系统资源信息', ha='center', va='center', fontsize=10)
+    collect_info = rect_box((6, 7), 4, 1, 
+                            facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(collect_info)
+    ax.text(8, 7.5, '13. 收集系统资源信息', ha='center', va='center', fontproperties=_FP_10)
     
     # 14. 分析资源使用情况
-    analyze_usage = FancyBboxPatch((6, 5.5), 4, 1, boxstyle="round,pad=0.1", 
-                                  facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(analyze_usage)
-    ax.text(8, 6, '14. 分析资源使用情况', ha='center', va='center', fontsize=10)
+    analyze_usage = rect_box((6, 5.5), 4, 1, 
+                             facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(analyze_usage)
+    ax.text(8, 6, '14. 分析资源使用情况', ha='center', va='center', fontproperties=_FP_10)
     
     # 15. 判断是否需要调度
     decision = Polygon([(8, 4.5), (6, 3.5), (10, 3.5)], facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(decision)
-    ax.text(8, 4, '15. 判断是否需要调度', ha='center', va='center', fontsize=10)
+    boxes.append(decision)
+    ax.text(8, 4, '15. 判断是否需要调度', ha='center', va='center', fontproperties=_FP_10)
     
     # 16. 执行资源调度算法
-    execute_scheduling = FancyBboxPatch((6, 2.5), 4, 1, boxstyle="round,pad=0.1", 
-                                       facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(execute_scheduling)
-    ax.text(8, 3, '16. 执行资源调度算法', ha='center', va='center', fontsize=10)
+    execute_scheduling = rect_box((6, 2.5), 4, 1, 
+                                  facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(execute_scheduling)
+    ax.text(8, 3, '16. 执行资源调度算法', ha='center', va='center', fontproperties=_FP_10)
     
     # 17. 更新容器资源配置
-    update_config = FancyBboxPatch((6, 1), 4, 1, boxstyle="round,pad=0.1", 
-                                  facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(update_config)
-    ax.text(8, 1.5, '17. 更新容器资源配置', ha='center', va='center', fontsize=10)
+    update_config = rect_box((6, 1), 4, 1, 
+                             facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(update_config)
+    ax.text(8, 1.5, '17. 更新容器资源配置', ha='center', va='center', fontproperties=_FP_10)
     
     # 18. 监控调度效果
-    monitor_effect = FancyBboxPatch((11, 4), 3, 1, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(monitor_effect)
-    ax.text(12.5, 4.5, '18. 监控调度效果', ha='center', va='center', fontsize=10)
+    monitor_effect = rect_box((11, 4), 3, 1, 
+                              facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(monitor_effect)
+    ax.text(12.5, 4.5, '18. 监控调度效果', ha='center', va='center', fontproperties=_FP_10)
     
     # 19. 记录调度日志
-    log_scheduling = FancyBboxPatch((11, 2.5), 3, 1, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(log_scheduling)
-    ax.text(12.5, 3, '19. 记录调度日志', ha='center', va='center', fontsize=10)
+    log_scheduling = rect_box((11, 2.5), 3, 1, 
+                              facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(log_scheduling)
+    ax.text(12.5, 3, '19. 记录调度日志', ha='center', va='center', fontproperties=_FP_10)
     
     # 20. 返回监控循环
-    return_loop = FancyBboxPatch((11, 1), 3, 1, boxstyle="round,pad=0.1", 
-                                facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(return_loop)
-    ax.text(12.5, 1.5, '20. 返回监控循环', ha='center', va='center', fontsize=10)
+    return_loop = rect_box((11, 1), 3, 1, 
+                           facecolor='white', edgecolor='black', linewidth=2)
+    boxes.append(return_loop)
+    ax.text(12.5, 1.5, '20. 返回监控循环', ha='center', va='center', fontproperties=_FP_10)
+    
+    ax.add_collection(PatchCollection(boxes, match_original=True))
+    
+    # 连接线（先收集，最后批量绘制）
+    arrows = []
     
-    # 连接线
     # 系统启动到初始化监控模块
-    ax.arrow(8, 9.5, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((8, 9.5, 0, -0.3))
     
     # 初始化监控模块到收集系统资源信息
-    ax.arrow(8, 8.5, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((8, 8.5, 0, -0.3))
     
     # 收集系统资源信息到分析资源使用情况
-    ax.arrow(8, 7, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((8, 7, 0, -0.3))
     
     # 分析资源使用情况到判断是否需要调度
-    ax.arrow(8, 5.5, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((8, 5.5, 0, -0.3))
     
     # 判断是否需要调度到执行资源调度算法
-    ax.arrow(8, 3.5, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((8, 3.5, 0, -0.3))
     
     # 执行资源调度算法到更新容器资源配置
-    ax.arrow(8, 2.5, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((8, 2.5, 0, -0.3))
     
     # 判断是否需要调度到监控调度效果
-    ax.arrow(10, 4, 0.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.text(10.5, 3.8, '否', ha='center', va='center', fontsize=8)
+    arrows.append((10, 4, 0.8, 0))
+    ax.text(10.5, 3.8, '否', ha='center', va='center', fontproperties=_FP_8)
     
     # 监控调度效果到记录调度日志
-    ax.arrow(12.5, 4, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((12.5, 4, 0, -0.3))
     
     # 记录调度日志到返回监控循环
-    ax.arrow(12.5, 2.5, 0, -0.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((12.5, 2.5, 0, -0.3))
     
     # 返回监控循环到收集系统资源信息
-    ax.arrow(11, 1.5, -4.8, 5.8, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((11, 1.5, -4.8, 5.8))
     
     # 判断分支标签
-    ax.text(7.5, 4.2, '是', ha='center', va='center', fontsize=8)
+    ax.text(7.5, 4.2, '是', ha='center', va='center', fontproperties=_FP_8)
     
-    plt.tight_layout()
-    plt.savefig('图2-算力调度流程图.png', dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    draw_arrows(ax, arrows)
 
-def create_monitoring_interface_diagram():
-    """生成资源监控界面图"""
-    fig, ax = plt.subplots(1, 1, figsize=(16, 12))
-    ax.set_xlim(0, 16)
-    ax.set_ylim(0, 12)
-    ax.axis('off')
-    
+def create_monitoring_interface_diagram(ax):
+    """在给定坐标轴上绘制资源监控界面图"""
     # 标题
-    ax.text(8, 11.5, '资源监控界面图', fontsize=16, fontweight='bold', ha='center')
+    ax.text(8, 11.5, '资源监控界面图', fontproperties=_FP_TITLE, ha='center')
+    
+    # 所有图形先收集起来，最后作为一个PatchCollection统一添加
+    boxes = []
     
     # 顶部区域 - 监控仪表板
     dashboard = FancyBboxPatch((0.5, 9), 15, 2, boxstyle="round,pad=0.1", 
                               facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(dashboard)
-    ax.text(8, 10.5, '监控仪表板', ha='center', va='center', fontsize=12, fontweight='bold')
+    boxes.append(dashboard)
+    ax.text(8, 10.5, '监控仪表板', ha='center', va='center', fontproperties=_FP_HEADING)
     
     # 21. CPU使用率图表
-    cpu_chart = FancyBboxPatch((1, 9.2), 4, 1.5, boxstyle="round,pad=0.1", 
-                               facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(cpu_chart)
-    ax.text(3, 9.95, '21. CPU使用率图表', ha='center', va='center', fontsize=10)
-    # 模拟CPU图表线条
-    x_cpu = np.linspace(1.2, 4.8, 10)
-    y_cpu = 9.5 + 0.8 * np.sin(x_cpu * 2) * np.exp(-x_cpu/3)
-    ax.plot(x_cpu, y_cpu, 'k-', linewidth=2)
-    ax.text(3, 9.3, '实时CPU使用率', ha='center', va='center', fontsize=8)
+    cpu_chart = rect_box((1, 9.2), 4, 1.5, 
+                         facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(cpu_chart)
+    ax.text(3, 9.95, '21. CPU使用率图表', ha='center', va='center', fontproperties=_FP_10)
+    ax.text(3, 9.3, '实时CPU使用率', ha='center', va='center', fontproperties=_FP_8)
     
     # 22. 内存使用率图表
-    memory_chart = FancyBboxPatch((5.5, 9.2), 4, 1.5, boxstyle="round,pad=0.1", 
-                                 facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(memory_chart)
-    ax.text(7.5, 9.95, '22. 内存使用率图表', ha='center', va='center', fontsize=10)
-    # 模拟内存图表线条
-    x_mem = np.linspace(5.7, 9.3, 10)
-    y_mem = 9.5 + 0.6 * np.cos(x_mem * 1.5) * np.exp(-x_mem/4)
-    ax.plot(x_mem, y_mem, 'k-', linewidth=2)
-    ax.text(7.5, 9.3, '实时内存使用率', ha='center', va='center', fontsize=8)
+    memory_chart = rect_box((5.5, 9.2), 4, 1.5, 
+                            facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(memory_chart)
+    ax.text(7.5, 9.95, '22. 内存使用率图表', ha='center', va='center', fontproperties=_FP_10)
+    ax.text(7.5, 9.3, '实时内存使用率', ha='center', va='center', fontproperties=_FP_8)
     
     # 23. 网络流量图表
-    network_chart = FancyBboxPatch((10, 9.2), 4, 1.5, boxstyle="round,pad=0.1", 
-                                  facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(network_chart)
-    ax.text(12, 9.95, '23. 网络流量图表', ha='center', va='center', fontsize=10)
-    # 模拟网络图表线条
-    x_net = np.linspace(10.2, 13.8, 10)
-    y_net = 9.5 + 0.7 * np.sin(x_net * 3) * np.exp(-x_net/5)
-    ax.plot(x_net, y_net, 'k-', linewidth=2)
-    ax.text(12, 9.3, '实时网络流量', ha='center', va='center', fontsize=8)
+    network_chart = rect_box((10, 9.2), 4, 1.5, 
+                             facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(network_chart)
+    ax.text(12, 9.95, '23. 网络流量图表', ha='center', va='center', fontproperties=_FP_10)
+    ax.text(12, 9.3, '实时网络流量', ha='center', va='center', fontproperties=_FP_8)
+    
+    # 模拟CPU/内存/网络图表线条，合并为一个LineCollection
+    ax.add_collection(LineCollection(MINI_CHART_LINES, colors='black', linewidths=2))
     
     # 中部区域 - 实例管理区域
     instance_area = FancyBboxPatch((0.5, 6), 10, 2.5, boxstyle="round,pad=0.1", 
                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(instance_area)
-    ax.text(5.5, 8, '实例管理区域', ha='center', va='center', fontsize=12, fontweight='bold')
+    boxes.append(instance_area)
+    ax.text(5.5, 8, '实例管理区域', ha='center', va='center', fontproperties=_FP_HEADING)
     
     # 24. 实例状态列表
-    instance_list = FancyBboxPatch((1, 6.2), 4, 2, boxstyle="round,pad=0.1", 
-                                  facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(instance_list)
-    ax.text(3, 7.7, '24. 实例状态列表', ha='center', va='center', fontsize=10)
+    instance_list = rect_box((1, 6.2), 4, 2, 
+                             facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(instance_list)
+    ax.text(3, 7.7, '24. 实例状态列表', ha='center', va='center', fontproperties=_FP_10)
     instances = ['实例1 - 运行中', '实例2 - 运行中', '实例3 - 已停止', '实例4 - 运行中',
                 '实例5 - 运行中', '实例6 - 已停止', '实例7 - 运行中', '实例8 - 运行中']
-    for i, instance in enumerate(instances):
-        ax.text(1.2, 7.4 - i*0.15, instance, ha='left', va='center', fontsize=8)
+    draw_text_lines(ax, 1.2, 7.4, instances, 0.15, ha='left')
     
     # 25. 系统负载指示器
-    load_indicator = FancyBboxPatch((5.5, 6.2), 2, 1.5, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(load_indicator)
-    ax.text(6.5, 7.4, '25. 系统负载指示器', ha='center', va='center', fontsize=10)
+    load_indicator = rect_box((5.5, 6.2), 2, 1.5, 
+                              facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(load_indicator)
+    ax.text(6.5, 7.4, '25. 系统负载指示器', ha='center', va='center', fontproperties=_FP_10)
     # 圆形负载指示器
     load_circle = patches.Circle((6.5, 6.8), 0.3, facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(load_circle)
-    ax.text(6.5, 6.8, '75%', ha='center', va='center', fontsize=10, fontweight='bold')
-    ax.text(6.5, 6.4, '系统负载', ha='center', va='center', fontsize=8)
+    boxes.append(load_circle)
+    ax.text(6.5, 6.8, '75%', ha='center', va='center', fontproperties=_FP_10_BOLD)
+    ax.text(6.5, 6.4, '系统负载', ha='center', va='center', fontproperties=_FP_8)
     
     # 26. 资源分配面板
-    resource_panel = FancyBboxPatch((5.5, 5.2), 2, 0.8, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(resource_panel)
-    ax.text(6.5, 5.6, '26. 资源分配面板', ha='center', va='center', fontsize=10)
-    ax.text(6.5, 5.4, 'CPU: 8核  内存: 16GB', ha='center', va='center', fontsize=8)
+    resource_panel = rect_box((5.5, 5.2), 2, 0.8, 
+                              facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(resource_panel)
+    ax.text(6.5, 5.6, '26. 资源分配面板', ha='center', va='center', fontproperties=_FP_10)
+    ax.text(6.5, 5.4, 'CPU: 8核  内存: 16GB', ha='center', va='center', fontproperties=_FP_8)
     
     # 右侧区域 - 控制面板
     control_panel = FancyBboxPatch((11.5, 6), 4, 2.5, boxstyle="round,pad=0.1", 
                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(control_panel)
-    ax.text(13.5, 8, '控制面板', ha='center', va='center', fontsize=12, fontweight='bold')
+    boxes.append(control_panel)
+    ax.text(13.5, 8, '控制面板', ha='center', va='center', fontproperties=_FP_HEADING)
     
     # 28. 操作控制按钮
     buttons = [
@@ -362,171 +472,93 @@ def create_monitoring_interface_diagram():
         ('配置实例', 6.3)
     ]
     for text, y_pos in buttons:
-        button = FancyBboxPatch((11.7, y_pos-0.1), 3.6, 0.3, boxstyle="round,pad=0.05", 
-                               facecolor='white', edgecolor='black', linewidth=1)
-        ax.add_patch(button)
-        ax.text(13.5, y_pos, text, ha='center', va='center', fontsize=9)
+        button = rect_box((11.7, y_pos-0.1), 3.6, 0.3, pad=0.05, 
+                          facecolor='white', edgecolor='black', linewidth=1)
+        boxes.append(button)
+        ax.text(13.5, y_pos, text, ha='center', va='center', fontproperties=_FP_9)
     
     # 底部区域 - 系统信息区域
     info_area = FancyBboxPatch((0.5, 3), 15, 2.5, boxstyle="round,pad=0.1", 
                               facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(info_area)
-    ax.text(8, 4.5, '系统信息区域', ha='center', va='center', fontsize=12, fontweight='bold')
+    boxes.append(info_area)
+    ax.text(8, 4.5, '系统信息区域', ha='center', va='center', fontproperties=_FP_HEADING)
     
     # 27. 告警信息区域
-    alert_area = FancyBboxPatch((1, 3.2), 6, 2, boxstyle="round,pad=0.1", 
-                               facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(alert_area)
-    ax.text(4, 4.7, '27. 告警信息区域', ha='center', va='center', fontsize=10)
+    alert_area = rect_box((1, 3.2), 6, 2, 
+                          facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(alert_area)
+    ax.text(4, 4.7, '27. 告警信息区域', ha='center', va='center', fontproperties=_FP_10)
     alerts = ['⚠ 实例1 CPU使用率过高', '⚠ 实例3内存不足', '✓ 系统运行正常', 'ℹ 网络连接正常']
-    for i, alert in enumerate(alerts):
-        ax.text(1.2, 4.4 - i*0.15, alert, ha='left', va='center', fontsize=8)
+    draw_text_lines(ax, 1.2, 4.4, alerts, 0.15, ha='left')
     
     # 29. 实时数据更新
-    data_update = FancyBboxPatch((7.5, 3.2), 3, 2, boxstyle="round,pad=0.1", 
-                                facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(data_update)
-    ax.text(9, 4.7, '29. 实时数据更新', ha='center', va='center', fontsize=10)
+    data_update = rect_box((7.5, 3.2), 3, 2, 
+                           facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(data_update)
+    ax.text(9, 4.7, '29. 实时数据更新', ha='center', va='center', fontproperties=_FP_10)
     data_info = ['最后更新: 2024-01-15', '14:30:25', '更新频率: 10秒', '数据源: 系统监控']
-    for i, info in enumerate(data_info):
-        ax.text(7.7, 4.4 - i*0.15, info, ha='left', va='center', fontsize=8)
+    draw_text_lines(ax, 7.7, 4.4, data_info, 0.15, ha='left')
     
     # 30. 历史数据查询
-    history_query = FancyBboxPatch((11, 3.2), 3, 2, boxstyle="round,pad=0.1", 
-                                  facecolor='white', edgecolor='black', linewidth=1)
-    ax.add_patch(history_query)
-    ax.text(12.5, 4.7, '30. 历史数据查询', ha='center', va='center', fontsize=10)
+    history_query = rect_box((11, 3.2), 3, 2, 
+                             facecolor='white', edgecolor='black', linewidth=1)
+    boxes.append(history_query)
+    ax.text(12.5, 4.7, '30. 历史数据查询', ha='center', va='center', fontproperties=_FP_10)
     history_info = ['查询范围: 24小时', '数据点: 8640个', '导出格式: CSV', '图表类型: 折线图']
-    for i, info in enumerate(history_info):
-        ax.text(11.2, 4.4 - i*0.15, info, ha='left', va='center', fontsize=8)
+    draw_text_lines(ax, 11.2, 4.4, history_info, 0.15, ha='left')
     
-    plt.tight_layout()
-    plt.savefig('图3-资源监控界面图.png', dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+    ax.add_collection(PatchCollection(boxes, match_original=True))
 
-def create_container_configuration_diagram():
-    """生成容器配置图"""
-    fig, ax = plt.subplots(1, 1, figsize=(16, 12))
-    ax.set_xlim(0, 16)
-    ax.set_ylim(0, 12)
-    ax.axis('off')
-    
+def create_container_configuration_diagram(ax):
+    """在给定坐标轴上绘制容器配置图"""
     # 标题
-    ax.text(8, 11.5, '容器配置图', fontsize=16, fontweight='bold', ha='center')
-    
-    # 第一行模块
-    # 31. 容器镜像仓库
-    image_repo = FancyBboxPatch((0.5, 9), 3, 1.5, boxstyle="round,pad=0.1", 
-                               facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(image_repo)
-    ax.text(2, 9.75, '31. 容器镜像仓库', ha='center', va='center', fontsize=10)
-    ax.text(2, 9.5, 'Docker Hub', ha='center', va='center', fontsize=8)
-    ax.text(2, 9.25, '私有仓库', ha='center', va='center', fontsize=8)
-    ax.text(2, 9, '本地镜像', ha='center', va='center', fontsize=8)
-    
-    # 32. 容器创建模块
-    container_create = FancyBboxPatch((4, 9), 3, 1.5, boxstyle="round,pad=0.1", 
-                                     facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(container_create)
-    ax.text(5.5, 9.75, '32. 容器创建模块', ha='center', va='center', fontsize=10)
-    ax.text(5.5, 9.5, '镜像拉取', ha='center', va='center', fontsize=8)
-    ax.text(5.5, 9.25, '容器初始化', ha='center', va='center', fontsize=8)
-    ax.text(5.5, 9, '基础配置', ha='center', va='center', fontsize=8)
-    
-    # 33. 资源限制配置
-    resource_limit = FancyBboxPatch((7.5, 9), 3, 1.5, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(resource_limit)
-    ax.text(9, 9.75, '33. 资源限制配置', ha='center', va='center', fontsize=10)
-    ax.text(9, 9.5, 'CPU限制', ha='center', va='center', fontsize=8)
-    ax.text(9, 9.25, '内存限制', ha='center', va='center', fontsize=8)
-    ax.text(9, 9, 'IO限制', ha='center', va='center', fontsize=8)
-    
-    # 34. 网络配置模块
-    network_config = FancyBboxPatch((11, 9), 3, 1.5, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(network_config)
-    ax.text(12.5, 9.75, '34. 网络配置模块', ha='center', va='center', fontsize=10)
-    ax.text(12.5, 9.5, '网络模式', ha='center', va='center', fontsize=8)
-    ax.text(12.5, 9.25, '端口映射', ha='center', va='center', fontsize=8)
-    ax.text(12.5, 9, '网络别名', ha='center', va='center', fontsize=8)
-    
-    # 第二行模块
-    # 35. 存储配置模块
-    storage_config = FancyBboxPatch((0.5, 7), 3, 1.5, boxstyle="round,pad=0.1", 
-                                   facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(storage_config)
-    ax.text(2, 7.75, '35. 存储配置模块', ha='center', va='center', fontsize=10)
-    ax.text(2, 7.5, '卷挂载', ha='center', va='center', fontsize=8)
-    ax.text(2, 7.25, '工作目录', ha='center', va='center', fontsize=8)
-    ax.text(2, 7, '数据持久化', ha='center', va='center', fontsize=8)
-    
-    # 36. 环境变量设置
-    env_vars = FancyBboxPatch((4, 7), 3, 1.5, boxstyle="round,pad=0.1", 
-                             facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(env_vars)
-    ax.text(5.5, 7.75, '36. 环境变量设置', ha='center', va='center', fontsize=10)
-    ax.text(5.5, 7.5, '系统环境', ha='center', va='center', fontsize=8)
-    ax.text(5.5, 7.25, '应用配置', ha='center', va='center', fontsize=8)
-    ax.text(5.5, 7, '运行时参数', ha='center', va='center', fontsize=8)
-    
-    # 37. 端口映射配置
-    port_mapping = FancyBboxPatch((7.5, 7), 3, 1.5, boxstyle="round,pad=0.1", 
-                                 facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(port_mapping)
-    ax.text(9, 7.75, '37. 端口映射配置', ha='center', va='center', fontsize=10)
-    ax.text(9, 7.5, '主机端口', ha='center', va='center', fontsize=8)
-    ax.text(9, 7.25, '容器端口', ha='center', va='center', fontsize=8)
-    ax.text(9, 7, '协议类型', ha='center', va='center', fontsize=8)
-    
-    # 38. 容器启动模块
-    container_start = FancyBboxPatch((11, 7), 3, 1.5, boxstyle="round,pad=0.1", 
-                                    facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(container_start)
-    ax.text(12.5, 7.75, '38. 容器启动模块', ha='center', va='center', fontsize=10)
-    ax.text(12.5, 7.5, '启动命令', ha='center', va='center', fontsize=8)
-    ax.text(12.5, 7.25, '运行参数', ha='center', va='center', fontsize=8)
-    ax.text(12.5, 7, '启动策略', ha='center', va='center', fontsize=8)
-    
-    # 第三行模块
-    # 39. 容器监控模块
-    container_monitor = FancyBboxPatch((3, 5), 3, 1.5, boxstyle="round,pad=0.1", 
-                                      facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(container_monitor)
-    ax.text(4.5, 5.75, '39. 容器监控模块', ha='center', va='center', fontsize=10)
-    ax.text(4.5, 5.5, '性能监控', ha='center', va='center', fontsize=8)
-    ax.text(4.5, 5.25, '状态检查', ha='center', va='center', fontsize=8)
-    ax.text(4.5, 5, '日志收集', ha='center', va='center', fontsize=8)
-    
-    # 40. 容器销毁模块
-    container_destroy = FancyBboxPatch((7.5, 5), 3, 1.5, boxstyle="round,pad=0.1", 
-                                      facecolor='white', edgecolor='black', linewidth=2)
-    ax.add_patch(container_destroy)
-    ax.text(9, 5.75, '40. 容器销毁模块', ha='center', va='center', fontsize=10)
-    ax.text(9, 5.5, '停止容器', ha='center', va='center', fontsize=8)
-    ax.text(9, 5.25, '删除容器', ha='center', va='center', fontsize=8)
-    ax.text(9, 5, '清理资源', ha='center', va='center', fontsize=8)
-    
-    # 连接线
+    ax.text(8, 11.5, '容器配置图', fontproperties=_FP_TITLE, ha='center')
+    
+    # 模块 (x, y, 标题, 说明)，外框均为 3x1.5
+    modules = [
+        # 第一行模块
+        (0.5, 9, '31. 容器镜像仓库', ['Docker Hub', '私有仓库', '本地镜像']),
+        (4, 9, '32. 容器创建模块', ['镜像拉取', '容器初始化', '基础配置']),
+        (7.5, 9, '33. 资源限制配置', ['CPU限制', '内存限制', 'IO限制']),
+        (11, 9, '34. 网络配置模块', ['网络模式', '端口映射', '网络别名']),
+        # 第二行模块
+        (0.5, 7, '35. 存储配置模块', ['卷挂载', '工作目录', '数据持久化']),
+        (4, 7, '36. 环境变量设置', ['系统环境', '应用配置', '运行时参数']),
+        (7.5, 7, '37. 端口映射配置', ['主机端口', '容器端口', '协议类型']),
+        (11, 7, '38. 容器启动模块', ['启动命令', '运行参数', '启动策略']),
+        # 第三行模块
+        (3, 5, '39. 容器监控模块', ['性能监控', '状态检查', '日志收集']),
+        (7.5, 5, '40. 容器销毁模块', ['停止容器', '删除容器', '清理资源']),
+    ]
+    
+    ax.add_collection(PolyCollection(box_vertices([(x, y, 3, 1.5) for x, y, _, _ in modules]),
+                                     facecolors='white', edgecolors='black', linewidths=2))
+    
+    # 同一列模块的标题、说明分别合并为一个Text对象
+    draw_text_columns(ax, [(x + 1.5, y + 0.75, [title]) for x, y, title, _ in modules], 2, _FP_10)
+    draw_text_columns(ax, [(x + 1.5, y + 0.5, details) for x, y, _, details in modules], 0.25)
+    
+    # 连接线（先收集，最后批量绘制）
+    arrows = []
+    
     # 第一行连接
-    ax.arrow(3.5, 9.75, 0.3, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.arrow(7, 9.75, 0.3, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.arrow(10.5, 9.75, 0.3, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((3.5, 9.75, 0.3, 0))
+    arrows.append((7, 9.75, 0.3, 0))
+    arrows.append((10.5, 9.75, 0.3, 0))
     
     # 第二行连接
-    ax.arrow(3.5, 7.75, 0.3, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.arrow(7, 7.75, 0.3, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.arrow(10.5, 7.75, 0.3, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((3.5, 7.75, 0.3, 0))
+    arrows.append((7, 7.75, 0.3, 0))
+    arrows.append((10.5, 7.75, 0.3, 0))
     
     # 垂直连接
-    ax.arrow(12.5, 8.5, -8.8, -1.3, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
-    ax.arrow(4.5, 6.5, 2.8, 0, head_width=0.1, head_length=0.1, fc='black', ec='black', linewidth=2)
+    arrows.append((12.5, 8.5, -8.8, -1.3))
+    arrows.append((4.5, 6.5, 2.8, 0))
     
-    # 反馈循环
-    feedback = ConnectionPatch((4.5, 5.75), (9, 9.75), "data", "data",
-                             arrowstyle="->", shrinkA=5, shrinkB=5, 
-                             mutation_scale=20, fc="black", ec="black", linewidth=2, linestyle='--')
-    ax.add_patch(feedback)
+    draw_arrows(ax, arrows)
+    
+    # 反馈循环：从39号模块指向33号模块的虚线箭头，两端各留出约5磅间隙
+    draw_arrows(ax, [(4.55, 5.8, 4.32, 3.84)], linestyle='--')
     
     # 标签
     labels = [
@@ -542,31 +574,93 @@ def create_container_configuration_diagram():
     ]
     
     for text, x, y in labels:
-        ax.text(x, y, text, ha='center', va='center', fontsize=8)
-    
-    plt.tight_layout()
-    plt.savefig('图4-容器配置图.png', dpi=300, bbox_inches='tight', facecolor='white')
-    plt.close()
+        ax.text(x, y, text, ha='center', va='center', fontproperties=_FP_8)
+
+# 图表文件名与对应的绘制函数
+DIAGRAMS = [
+    ('图1-系统整体架构图.svg', create_system_architecture_diagram),
+    ('图2-算力调度流程图.svg', create_scheduling_flow_diagram),
+    ('图3-资源监控界面图.svg', create_monitoring_interface_diagram),
+    ('图4-容器配置图.svg', create_container_configuration_diagram),
+]
+
+def reset_axes(ax):
+    """清空坐标轴并恢复统一的画布范围"""
+    ax.clear()
+    ax.set_xlim(0, 16)
+    ax.set_ylim(0, 12)
+    ax.axis('off')
+
+# 工作进程内共用的坐标轴，由 init_worker 创建
+_worker_ax = None
+
+def init_worker():
+    """工作进程初始化：设置字体并创建本进程内所有图表共用的Figure"""
+    global _worker_ax
+    # 已在模块导入时执行过的进程会直接命中 lru_cache
+    setup_chinese_font()
+    fig, _worker_ax = plt.subplots(1, 1, figsize=(16, 12))
+    # 坐标轴铺满画布，布局固定，无需 tight_layout 或 bbox_inches='tight'
+    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
+
+def render_diagram(diagram):
+    """在工作进程中绘制并保存单张图表，返回文件名"""
+    filename, create_diagram = diagram
+    reset_axes(_worker_ax)
+    create_diagram(_worker_ax)
+    # 线条图直接输出矢量SVG，无需光栅化
+    _worker_ax.figure.savefig(filename, format='svg', facecolor='white')
+    return filename
+
+# 记录每张图表对应源码哈希的清单文件
+DIAGRAM_CACHE_PATH = '.diagram_cache.json'
+
+@functools.lru_cache(maxsize=1)
+def module_source():
+    """读取本模块源码，同一次运行只读取一次"""
+    with open(__file__, 'rb') as f:
+        return f.read()
+
+def diagram_hash(create_diagram):
+    """根据整个模块源码与绘制函数名计算哈希
+    共用函数、字体与绘图参数等模块级设置的任何修改都会使所有图表重新生成
+    """
+    digest = hashlib.sha256(module_source())
+    digest.update(create_diagram.__name__.encode('utf-8'))
+    return digest.hexdigest()
+
+def load_diagram_cache():
+    """读取图表哈希清单，文件不存在或损坏时返回空字典"""
+    try:
+        with open(DIAGRAM_CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
 def main():
     """主函数"""
     print("正在生成专利图表...")
     
-    # 生成系统整体架构图
-    print("生成图1-系统整体架构图.png")
-    create_system_architecture_diagram()
-    
-    # 生成算力调度流程图
-    print("生成图2-算力调度流程图.png")
-    create_scheduling_flow_diagram()
-    
-    # 生成资源监控界面图
-    print("生成图3-资源监控界面图.png")
-    create_monitoring_interface_diagram()
-    
-    # 生成容器配置图
-    print("生成图4-容器配置图.png")
-    create_container_configuration_diagram()
+    cache = load_diagram_cache()
+    hashes = {filename: diagram_hash(fn) for filename, fn in DIAGRAMS}
+    pending = []
+    for filename, fn in DIAGRAMS:
+        # 源码未变且输出文件仍在的图表直接跳过
+        if cache.get(filename) == hashes[filename] and os.path.exists(filename):
+            print(f"跳过{filename}（未变化）")
+        else:
+            pending.append((filename, fn))
+    
+    if pending:
+        # 图表互不依赖，分派到多个进程并行渲染；同一进程内的图表共用一个Figure
+        processes = min(len(pending), os.cpu_count() or 1)
+        with multiprocessing.Pool(processes, initializer=init_worker) as pool:
+            for filename in pool.imap_unordered(render_diagram, pending):
+                cache[filename] = hashes[filename]
+                print(f"生成{filename}")
+        
+        with open(DIAGRAM_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
     
     print("所有图表生成完成！")
 